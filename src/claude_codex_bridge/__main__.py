@@ -6,8 +6,6 @@ import asyncio
 import os
 import sys
 
-from .bridge_server import mcp
-
 
 def main() -> None:
     """Main entry point with command-line argument support."""
@@ -41,6 +39,10 @@ def main() -> None:
     os.environ["CODEX_ALLOW_WRITE"] = "true" if args.allow_write else "false"
     os.environ["CODEX_BACKEND"] = "cli" if args.legacy_cmd else "mcp"
 
+    # Imported only now: the server reads its settings and builds its
+    # instructions from the environment at import time
+    from .bridge_server import mcp
+
     # Display startup information
     mode = "READ-WRITE" if args.allow_write else "READ-ONLY (Planning & Analysis)"
     backend = "legacy CLI (codex exec)" if args.legacy_cmd else "MCP"
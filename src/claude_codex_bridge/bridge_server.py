@@ -6,10 +6,33 @@ between Claude and OpenAI Codex CLI.
 """
 
 import asyncio
+import codecs
+import contextlib
+import dataclasses
+import functools
+import hashlib
 import json
 import logging
 import os
-from typing import Any, Dict, List, Literal, Optional, Tuple, Union
+import re
+import signal
+import subprocess  # nosec B404 - Codex CLI is launched without a shell
+import sys
+from collections import OrderedDict
+from typing import (
+    Any,
+    AsyncContextManager,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Dict,
+    List,
+    Literal,
+    Optional,
+    Set,
+    Tuple,
+    Union,
+)
 
 from mcp.server.fastmcp import FastMCP
 
@@ -20,14 +43,91 @@ except ImportError:
     from engine import DelegationDecisionEngine  # type: ignore[no-redef]
 
 
-def _get_dynamic_instructions() -> str:
+def _env_int(name: str, default: int, minimum: int) -> int:
+    """Read an integer setting from the environment, clamped to `minimum`."""
+    try:
+        return max(minimum, int(os.environ.get(name, str(default))))
+    except ValueError:
+        return default
+
+
+def _get_max_concurrency() -> int:
+    """Return the maximum number of concurrent Codex runs (CODEX_MAX_CONCURRENCY)."""
+    return _env_int("CODEX_MAX_CONCURRENCY", 4, minimum=1)
+
+
+def _get_batch_window() -> float:
+    """Return the delegation batching window in seconds (CODEX_BATCH_WINDOW_MS)."""
+    try:
+        return max(0.0, float(os.environ.get("CODEX_BATCH_WINDOW_MS", "0"))) / 1000
+    except ValueError:
+        return 0.0
+
+
+def _get_codex_backend() -> str:
     """
-    Generate dynamic instructions based on whether write operations are allowed.
-    Only includes sandbox mode information when --allow-write is enabled.
+    Return selected Codex backend. Defaults to 'mcp' unless overridden
+    via the CODEX_BACKEND environment variable (set by --legacy-cmd).
+    """
+    backend = os.environ.get("CODEX_BACKEND", "mcp").strip().lower()
+    if backend not in {"mcp", "cli"}:
+        backend = "mcp"
+    return backend
+
+
+@dataclasses.dataclass(frozen=True)
+class BridgeConfig:
+    """Environment-driven settings, read once instead of on every request."""
+
+    # Whether write operations are allowed (CODEX_ALLOW_WRITE, default: False)
+    allow_write: bool
+    # Codex backend, "mcp" or "cli" (CODEX_BACKEND)
+    backend: str
+    # Maximum concurrent Codex runs (CODEX_MAX_CONCURRENCY)
+    max_concurrency: int
+    # Idle Codex MCP sessions kept across all configurations (CODEX_MCP_POOL_SIZE)
+    mcp_pool_size: int
+    # Delegation batching window in seconds (CODEX_BATCH_WINDOW_MS)
+    batch_window: float
+    # Whether parse results are memoized (CODEX_PARSE_CACHE)
+    parse_cache: bool
+    # Characters of output kept in error responses (CODEX_MAX_ERROR_CONTENT)
+    max_error_content: int
+
+    @classmethod
+    def from_env(cls) -> "BridgeConfig":
+        """Build a configuration snapshot from the current environment."""
+        allow_write = os.environ.get("CODEX_ALLOW_WRITE", "false").strip().lower()
+        return cls(
+            allow_write=allow_write in ("1", "true", "yes"),
+            backend=_get_codex_backend(),
+            max_concurrency=_get_max_concurrency(),
+            mcp_pool_size=_env_int("CODEX_MCP_POOL_SIZE", 2, minimum=0),
+            batch_window=_get_batch_window(),
+            parse_cache=os.environ.get("CODEX_PARSE_CACHE", "1").strip() != "0",
+            max_error_content=_env_int("CODEX_MAX_ERROR_CONTENT", 16384, minimum=0),
+        )
+
+
+config = BridgeConfig.from_env()
+
+
+def reload_config() -> BridgeConfig:
     """
-    allow_write = os.environ.get("CODEX_ALLOW_WRITE", "false").lower() == "true"
+    Re-read settings from the environment.
 
-    base_instructions = """An intelligent MCP server that leverages Codex's exceptional
+    Settings are read once when this module is imported, so the entry point
+    translates CLI flags (such as --allow-write) into environment variables
+    before importing it. Server instructions are fixed at import and are not
+    refreshed by a reload.
+    """
+    global config
+    config = BridgeConfig.from_env()
+    return config
+
+
+# Server instructions shown to MCP clients
+_BASE_INSTRUCTIONS = """An intelligent MCP server that leverages Codex's exceptional
 capabilities in code analysis, architectural planning, and complex problem-solving.
 
 Codex excels at:
@@ -41,28 +141,52 @@ Callers should assess each task's difficulty and set the
 `task_complexity` parameter ("minimal", "low", "medium", or "high") accordingly to
 guide Codex's reasoning effort."""
 
-    if allow_write:
-        # Only when write is enabled, include sandbox mode information
-        return (
-            base_instructions
-            + """
+# Appended only when write operations are allowed
+_WRITE_MODE_INSTRUCTIONS = """
 
 By default, operates in read-only mode for safety. Enable write mode with --allow-write
 when you're ready to apply Codex's recommendations."""
-        )
-    else:
-        # When write is disabled, no mention of modes at all
-        return base_instructions
+
+
+def _get_dynamic_instructions() -> str:
+    """
+    Generate dynamic instructions based on whether write operations are allowed.
+    Only includes sandbox mode information when --allow-write is enabled.
+    """
+    if config.allow_write:
+        # Only when write is enabled, include sandbox mode information
+        return _BASE_INSTRUCTIONS + _WRITE_MODE_INSTRUCTIONS
+    # When write is disabled, no mention of modes at all
+    return _BASE_INSTRUCTIONS
+
+
+@contextlib.asynccontextmanager
+async def _server_lifespan(server: FastMCP) -> AsyncIterator[None]:
+    """Shut down pooled Codex MCP sessions when the server stops."""
+    try:
+        yield
+    finally:
+        await codex_pool.close()
 
 
 # Initialize FastMCP instance
 mcp = FastMCP(
     name="claude-codex-bridge",
     instructions=_get_dynamic_instructions(),
+    lifespan=_server_lifespan,
 )
 
-# Initialize Delegation Decision Engine
-dde = DelegationDecisionEngine()
+# Delegation Decision Engine, created on first use (see _get_dde)
+_dde: Optional[DelegationDecisionEngine] = None
+
+
+def _get_dde() -> DelegationDecisionEngine:
+    """Return the shared Delegation Decision Engine, creating it on first use."""
+    global _dde
+    if _dde is None:
+        _dde = DelegationDecisionEngine()
+    return _dde
+
 
 # Module logger
 logger = logging.getLogger(__name__)
@@ -73,18 +197,320 @@ FINAL_OUTPUT_DELIMITER: str = os.environ.get(
     "FINAL_OUTPUT_DELIMITER", "=x=x=x=x=x=x=x="
 )
 
-# Write operations will be checked dynamically in codex_delegate function
+# Memoized parse_codex_output results, keyed by a digest of stdout plus the
+# parsing options. Disable with CODEX_PARSE_CACHE=0. Bounded both by entry
+# count and by the total length of the cached `content` fields.
+_PARSE_CACHE_MAXSIZE = 256
+_PARSE_CACHE_MAX_CHARS = 16 * 1024 * 1024
 
 
-def _get_codex_backend() -> str:
+class _ParseCache:
+    """LRU cache of parse results bounded by entries and total content size."""
+
+    def __init__(self) -> None:
+        self._entries: "OrderedDict[Tuple[Any, ...], Tuple[Dict[str, Any], int]]" = (
+            OrderedDict()
+        )
+        self._chars = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def chars(self) -> int:
+        """Total length of the cached `content` fields."""
+        return self._chars
+
+    def get(self, key: Tuple[Any, ...]) -> Optional[Dict[str, Any]]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        self._entries.move_to_end(key)
+        return entry[0]
+
+    def put(self, key: Tuple[Any, ...], result: Dict[str, Any]) -> None:
+        size = len(result.get("content") or "")
+        if size > _PARSE_CACHE_MAX_CHARS or key in self._entries:
+            return
+        self._entries[key] = (result, size)
+        self._chars += size
+        while (
+            len(self._entries) > _PARSE_CACHE_MAXSIZE
+            or self._chars > _PARSE_CACHE_MAX_CHARS
+        ):
+            _, (_, evicted) = self._entries.popitem(last=False)
+            self._chars -= evicted
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._chars = 0
+
+
+_parse_cache = _ParseCache()
+
+# Lowercase keywords that mark output as code when no diff headers are found
+_DETECTION_KEYWORDS = frozenset({"file:", "class ", "function ", "def ", "import "})
+
+# Markers used to auto-detect the output type in a single scan. Keywords are
+# matched case-insensitively (ASCII only, mirroring str.lower() for them) as
+# plain substrings, so no word-boundary anchors are added.
+_DETECT_RE = re.compile(
+    r"(--- a/)|(\+\+\+ b/)|(```)|(?i:"
+    + "|".join(re.escape(keyword) for keyword in sorted(_DETECTION_KEYWORDS))
+    + ")",
+    re.ASCII,
+)
+
+# Format-specific instructions injected into every Codex prompt
+_FORMAT_INSTRUCTIONS: Dict[str, str] = {
+    "diff": (
+        "Inside the wrapper, output a unified diff only in git patch format "
+        "starting with '--- a/' and '+++ b/' headers. Do not include code "
+        "fences, comments, or extra text."
+    ),
+    "full_file": (
+        "Inside the wrapper, output only the complete final file content(s) "
+        "without any code fences or commentary. If multiple files, separate "
+        "each with a line 'File: <path>' followed by the file content."
+    ),
+    "explanation": (
+        "Inside the wrapper, output only the explanation as plain text, "
+        "with no code fences or extraneous headers."
+    ),
+}
+
+# Leading whitespace after a single-line delimiter (same set as str.lstrip())
+_WS_RE = re.compile(r"\s*")
+
+
+# Constant Codex CLI argument fragments, shared by every invocation
+_BASE_CMD: Tuple[str, ...] = ("codex", "exec")
+_NO_WRITE_ARGS: Tuple[str, ...] = ("-c", "sandbox_permissions=[]")
+
+# Pipe read size, and how much trailing stderr is kept for diagnostics
+_READ_CHUNK_SIZE = 64 * 1024
+_STDERR_TAIL_LIMIT = 64 * 1024
+
+# Seconds a timed-out Codex process gets to exit after SIGINT, then SIGTERM
+_SIGINT_GRACE = 1.0
+_TERMINATE_GRACE = 2.0
+
+# Limits concurrent Codex runs across backends; created lazily because a
+# semaphore binds to the event loop it is first used on
+_codex_semaphore: Optional[asyncio.Semaphore] = None
+_codex_semaphore_loop: Optional[asyncio.AbstractEventLoop] = None
+_codex_semaphore_limit = 0
+
+
+def _get_codex_semaphore() -> asyncio.Semaphore:
+    """Return the Codex concurrency limiter for the running event loop."""
+    global _codex_semaphore, _codex_semaphore_loop, _codex_semaphore_limit
+
+    loop = asyncio.get_running_loop()
+    if (
+        _codex_semaphore is None
+        or _codex_semaphore_loop is not loop
+        or _codex_semaphore_limit != config.max_concurrency
+    ):
+        _codex_semaphore = asyncio.Semaphore(config.max_concurrency)
+        _codex_semaphore_loop = loop
+        _codex_semaphore_limit = config.max_concurrency
+    return _codex_semaphore
+
+
+class _CodexProcess:
     """
-    Return selected Codex backend. Defaults to 'mcp' unless overridden
-    via the CODEX_BACKEND environment variable (set by --legacy-cmd).
+    Minimal asyncio view of a subprocess.Popen started off the event loop.
+
+    Mirrors the parts of asyncio.subprocess.Process that invoke_codex_cli
+    uses, with stdout/stderr adopted as asyncio stream readers, plus close()
+    to release the pipe transports.
     """
-    backend = os.environ.get("CODEX_BACKEND", "mcp").strip().lower()
-    if backend not in {"mcp", "cli"}:
-        backend = "mcp"
-    return backend
+
+    def __init__(
+        self,
+        popen: "subprocess.Popen[bytes]",
+        stdout: asyncio.StreamReader,
+        stderr: asyncio.StreamReader,
+        transports: Tuple[asyncio.BaseTransport, ...] = (),
+    ) -> None:
+        self._popen = popen
+        self._transports = transports
+        self.stdout = stdout
+        self.stderr = stderr
+
+    @property
+    def returncode(self) -> Optional[int]:
+        return self._popen.returncode
+
+    async def wait(self) -> int:
+        """Wait for the process to exit without blocking the event loop."""
+        if self._popen.returncode is not None:
+            return self._popen.returncode
+        return await asyncio.to_thread(self._popen.wait)
+
+    def send_signal(self, sig: int) -> None:
+        self._popen.send_signal(sig)
+
+    def terminate(self) -> None:
+        self._popen.terminate()
+
+    def kill(self) -> None:
+        self._popen.kill()
+
+    def close(self) -> None:
+        """Close the pipe transports, releasing their file descriptors."""
+        for transport in self._transports:
+            transport.close()
+
+
+_ProcessLike = Union[asyncio.subprocess.Process, _CodexProcess]
+
+
+def _reap_process(popen: "subprocess.Popen[bytes]") -> None:
+    """
+    Kill an abandoned child and collect its exit status off the event loop so
+    it does not linger as a zombie or block on pipes nobody reads.
+    """
+    with contextlib.suppress(ProcessLookupError):
+        popen.kill()
+    for pipe in (popen.stdout, popen.stderr):
+        if pipe is not None:
+            pipe.close()
+    asyncio.get_running_loop().run_in_executor(None, popen.wait)
+
+
+async def _spawn_codex_process(*command: str) -> _ProcessLike:
+    """
+    Start a Codex CLI process with stdout/stderr piped.
+
+    asyncio.create_subprocess_exec runs fork/exec on the event loop thread,
+    which stalls every other coroutine while a large binary like the Node-based
+    Codex CLI is loaded. On POSIX the Popen call runs in the default executor
+    and its pipes are then attached to the loop.
+    """
+    if sys.platform == "win32":
+        # Proactor pipes cannot adopt Popen handles; spawning there does not
+        # go through fork, so the stock helper is fine
+        return await asyncio.create_subprocess_exec(
+            *command,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+        )
+
+    def _popen() -> "subprocess.Popen[bytes]":
+        return subprocess.Popen(  # nosec B603 - arguments are passed as a list
+            list(command),
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+        )
+
+    loop = asyncio.get_running_loop()
+    spawn = loop.run_in_executor(None, _popen)
+    try:
+        # Shielded so a cancelled caller does not orphan the started child
+        popen = await asyncio.shield(spawn)
+    except asyncio.CancelledError:
+
+        def _reap_started(done: "asyncio.Future[subprocess.Popen[bytes]]") -> None:
+            if not done.cancelled() and done.exception() is None:
+                _reap_process(done.result())
+
+        spawn.add_done_callback(_reap_started)
+        raise
+
+    transports: List[asyncio.BaseTransport] = []
+
+    async def _adopt(pipe: Any) -> asyncio.StreamReader:
+        reader = asyncio.StreamReader()
+        transport, _ = await loop.connect_read_pipe(
+            lambda: asyncio.StreamReaderProtocol(reader), pipe
+        )
+        transports.append(transport)
+        return reader
+
+    try:
+        stdout = await _adopt(popen.stdout)
+        stderr = await _adopt(popen.stderr)
+    except BaseException:
+        for transport in transports:
+            transport.close()
+        _reap_process(popen)
+        raise
+    return _CodexProcess(popen, stdout, stderr, tuple(transports))
+
+
+async def _read_text_stream(reader: asyncio.StreamReader) -> str:
+    """Read a UTF-8 stream to EOF, decoding chunks as they arrive."""
+    decoder = codecs.getincrementaldecoder("utf-8")()
+    parts: List[str] = []
+    while True:
+        chunk = await reader.read(_READ_CHUNK_SIZE)
+        if not chunk:
+            break
+        parts.append(decoder.decode(chunk))
+    parts.append(decoder.decode(b"", final=True))
+    return "".join(parts)
+
+
+async def _read_stream_tail(reader: asyncio.StreamReader, limit: int) -> bytes:
+    """Read a stream to EOF, keeping only its last `limit` bytes."""
+    tail = bytearray()
+    while True:
+        chunk = await reader.read(_READ_CHUNK_SIZE)
+        if not chunk:
+            break
+        tail += chunk
+        if len(tail) > limit:
+            del tail[:-limit]
+    return bytes(tail)
+
+
+async def _collect_process_output(process: _ProcessLike) -> Tuple[str, bytes]:
+    """
+    Drain stdout and stderr concurrently, then wait for the process to exit.
+
+    Stdout is decoded incrementally, which keeps multibyte characters that
+    straddle chunks intact. Only the tail of stderr is kept since it is used
+    for diagnostics, which bounds its memory regardless of how much Codex
+    writes there.
+    """
+    if process.stdout is None or process.stderr is None:
+        raise RuntimeError("Codex CLI process is missing output pipes")
+    stdout, stderr = await asyncio.gather(
+        _read_text_stream(process.stdout),
+        _read_stream_tail(process.stderr, _STDERR_TAIL_LIMIT),
+    )
+    await process.wait()
+    return stdout, stderr
+
+
+async def _stop_codex_process(process: _ProcessLike) -> None:
+    """
+    Stop a Codex process, escalating from SIGINT to SIGTERM to SIGKILL.
+
+    SIGINT lets Codex shut down cleanly; each step gets a short grace period
+    before the next, harsher signal is sent.
+    """
+    steps: List[Tuple[Callable[[], None], float]] = [
+        (process.terminate, _TERMINATE_GRACE),
+    ]
+    if sys.platform != "win32":
+        # Windows has no SIGINT for child processes; start at terminate()
+        steps.insert(0, (lambda: process.send_signal(signal.SIGINT), _SIGINT_GRACE))
+
+    for send, grace in steps:
+        with contextlib.suppress(ProcessLookupError):
+            send()
+        try:
+            await asyncio.wait_for(process.wait(), timeout=grace)
+            return
+        except asyncio.TimeoutError:
+            continue
+
+    with contextlib.suppress(ProcessLookupError):
+        process.kill()
+    await process.wait()
 
 
 async def invoke_codex_cli(
@@ -97,9 +523,9 @@ async def invoke_codex_cli(
     model_max_output_tokens: int = 100000,
     tools_web_search: bool = False,
     timeout: int = 3600,  # 1 hour timeout
-) -> Tuple[str, str]:
+) -> Tuple[str, bytes]:
     """
-    Asynchronously invoke Codex CLI and return its stdout and stderr.
+    Asynchronously invoke Codex CLI and return its stdout and raw stderr.
 
     Args:
         prompt: The main instruction to send to Codex CLI
@@ -113,22 +539,17 @@ async def invoke_codex_cli(
         timeout: Command timeout in seconds
 
     Returns:
-        Tuple containing (stdout, stderr)
+        Tuple containing (stdout, stderr), with stderr as undecoded bytes
 
     Raises:
         RuntimeError: When Codex CLI execution fails
         asyncio.TimeoutError: When command times out
     """
-    # Build base command
-    command = ["codex", "exec"]
-
-    # Always specify working directory (critical)
-    command.extend(["-C", working_directory])
-
-    # Configure file write permissions through sandbox_permissions
+    # Always specify working directory (critical), and disable file operations
+    # with empty sandbox_permissions when writes are not allowed
+    command: Tuple[str, ...] = _BASE_CMD + ("-C", working_directory)
     if not allow_write:
-        # Disable file operations by using empty sandbox_permissions
-        command.extend(["-c", "sandbox_permissions=[]"])
+        command += _NO_WRITE_ARGS
 
     # Use convenience mode or specify parameters separately
     if (
@@ -137,73 +558,268 @@ async def invoke_codex_cli(
         and allow_write
     ):
         # Use convenient --full-auto mode (only when write is allowed)
-        command.append("--full-auto")
+        command += ("--full-auto",)
     else:
         # Specify sandbox mode only (approval mode not available for exec subcommand)
-        command.extend(["-s", sandbox_mode])
+        command += ("-s", sandbox_mode)
 
-    # Configure model reasoning effort, max output tokens, and tools
-    command.extend(["-c", f'model_reasoning_effort="{task_complexity}"'])
-    command.extend(["-c", f"model_max_output_tokens={model_max_output_tokens}"])
-    command.extend(
-        [
-            "-c",
-            f"tools.web_search={'true' if tools_web_search else 'false'}",
-        ]
+    # Configure model reasoning effort, max output tokens, and tools, then add
+    # a `--` delimiter so any leading dashes in the prompt are treated as
+    # positional text rather than CLI flags; the prompt is the final argument
+    command += (
+        "-c",
+        f'model_reasoning_effort="{task_complexity}"',
+        "-c",
+        f"model_max_output_tokens={model_max_output_tokens}",
+        "-c",
+        f"tools.web_search={'true' if tools_web_search else 'false'}",
+        "--",
+        prompt,
     )
 
-    # Add delimiter to ensure any leading dashes in prompt
-    # are treated as positional text, not CLI flags
-    command.append("--")
+    async with _get_codex_semaphore():
+        process: Optional[_ProcessLike] = None
+        collector: Optional["asyncio.Future[Tuple[str, bytes]]"] = None
+        try:
+            # Execute subprocess without blocking the event loop during spawn
+            # The child inherits our cwd; Codex switches to the working
+            # directory itself via -C, avoiding an extra chdir during spawn
+            process = await _spawn_codex_process(*command)
+
+            # Stream output until the process exits (with timeout). The
+            # collector is shielded so it keeps draining the pipes while a
+            # timed-out process is being stopped.
+            collector = asyncio.ensure_future(_collect_process_output(process))
+            stdout, stderr = await asyncio.wait_for(
+                asyncio.shield(collector), timeout=timeout
+            )
 
-    # Add prompt as final positional argument
-    command.append(prompt)
+            # Check exit code
+            if process.returncode != 0:
+                error_message = (
+                    stderr.decode("utf-8", errors="replace").strip()
+                    if stderr
+                    else "Unknown error"
+                )
+                raise RuntimeError(
+                    f"Codex CLI execution failed (exit code: {process.returncode}): "
+                    f"{error_message}"
+                )
 
-    process = None
-    try:
-        # Execute subprocess asynchronously
-        process = await asyncio.create_subprocess_exec(
-            *command,
-            stdout=asyncio.subprocess.PIPE,
-            stderr=asyncio.subprocess.PIPE,
-            cwd=working_directory,  # Also set as double protection
-        )
+            # stderr stays raw; it is only decoded if the caller reports it
+            return stdout, stderr
 
-        # Wait for process completion (with timeout)
-        stdout, stderr = await asyncio.wait_for(process.communicate(), timeout=timeout)
+        except asyncio.TimeoutError:
+            # Timeout handling
+            if process is not None:
+                await _stop_codex_process(process)
 
-        # Check exit code
-        if process.returncode != 0:
-            error_message = (
-                stderr.decode("utf-8").strip() if stderr else "Unknown error"
+            raise asyncio.TimeoutError(
+                f"Codex CLI execution timed out (exceeded {timeout} seconds)"
             )
+
+        except FileNotFoundError:
             raise RuntimeError(
-                f"Codex CLI execution failed (exit code: {process.returncode}): "
-                f"{error_message}"
+                "codex command not found. Please ensure OpenAI Codex CLI is "
+                "installed: npm install -g @openai/codex"
             )
 
-        return stdout.decode("utf-8"), stderr.decode("utf-8")
+        finally:
+            # Descendants may still hold the pipes open; stop reading them
+            if collector is not None and not collector.done():
+                collector.cancel()
+                with contextlib.suppress(asyncio.CancelledError):
+                    await collector
+            if isinstance(process, _CodexProcess):
+                process.close()
 
-    except asyncio.TimeoutError:
-        # Timeout handling
-        if process is not None:
-            try:
-                process.terminate()
-                await asyncio.wait_for(process.wait(), timeout=5)
-            except asyncio.TimeoutError:
-                process.kill()
-                await process.wait()
 
-        raise asyncio.TimeoutError(
-            f"Codex CLI execution timed out (exceeded {timeout} seconds)"
-        )
+# Idle Codex MCP sessions are shut down after this many seconds
+_MCP_IDLE_TTL = 120.0
 
-    except FileNotFoundError:
-        raise RuntimeError(
-            "codex command not found. Please ensure OpenAI Codex CLI is "
-            "installed: npm install -g @openai/codex"
+# Seconds an idle Codex MCP session gets to answer a ping before reuse
+_MCP_PING_TIMEOUT = 5.0
+
+
+class _CodexWorker:
+    """
+    A long-lived `codex mcp` session held open by a background task.
+
+    The session's context managers must be entered and exited in the same
+    task, so a dedicated task owns them while callers use `session` directly.
+    """
+
+    def __init__(self, open_session: Callable[[], AsyncContextManager[Any]]) -> None:
+        self._open_session = open_session
+        self._closing = asyncio.Event()
+        self._task: Optional["asyncio.Task[None]"] = None
+        self.session: Any = None
+        # Tool selected on first use; discovery is done once per process
+        self.tool: Any = None
+
+    @property
+    def alive(self) -> bool:
+        """Whether the underlying session is still open and usable."""
+        return (
+            self._task is not None
+            and not self._task.done()
+            and not self._closing.is_set()
         )
 
+    async def start(self) -> None:
+        """Spawn the Codex process and wait until its session is initialized."""
+        ready: "asyncio.Future[Any]" = asyncio.get_running_loop().create_future()
+        self._task = asyncio.create_task(self._hold(ready))
+        try:
+            self.session = await ready
+        except BaseException:
+            self._task.cancel()
+            raise
+
+    async def _hold(self, ready: "asyncio.Future[Any]") -> None:
+        try:
+            async with self._open_session() as session:
+                if ready.done():
+                    return
+                ready.set_result(session)
+                await self._closing.wait()
+        except asyncio.CancelledError:
+            if not ready.done():
+                ready.cancel()
+            raise
+        except Exception as exc:  # noqa: BLE001
+            if not ready.done():
+                ready.set_exception(exc)
+            else:
+                logger.debug("Codex MCP worker exited with error: %s", exc)
+
+    async def close(self, timeout: float = 10.0) -> None:
+        """Shut down the session and its Codex process."""
+        self._closing.set()
+        if self._task is None or self._task.done():
+            return
+        _, pending = await asyncio.wait({self._task}, timeout=timeout)
+        if pending:
+            self._task.cancel()
+
+
+class CodexWorkerPool:
+    """
+    Reuses `codex mcp` sessions across delegations to avoid a process spawn,
+    MCP handshake, and tool discovery on every call.
+
+    Sessions are keyed by their launch parameters (command, args, cwd), which
+    fix Codex's policies for the lifetime of the process. A worker is returned
+    to the pool only after a successful call; any error discards it.
+
+    Idle workers are bounded across all keys: the least recently used one is
+    shut down when the cap is exceeded, and any worker idle for longer than
+    _MCP_IDLE_TTL seconds is shut down as well. An idle worker is pinged before
+    it is handed out, so a process that died while idle is replaced by a fresh
+    one instead of failing the call.
+    """
+
+    def __init__(self) -> None:
+        # Idle workers with their keys, least recently released first
+        self._idle: List[Tuple[Tuple[Any, ...], _CodexWorker]] = []
+        self._expiry: Dict[_CodexWorker, asyncio.TimerHandle] = {}
+        self._closing: Set["asyncio.Task[None]"] = set()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def __len__(self) -> int:
+        """Number of idle workers."""
+        return len(self._idle)
+
+    def _remove(self, index: int) -> _CodexWorker:
+        _, worker = self._idle.pop(index)
+        handle = self._expiry.pop(worker, None)
+        if handle is not None:
+            handle.cancel()
+        return worker
+
+    def _expire(self, worker: _CodexWorker) -> None:
+        """Shut down a worker that has been idle for too long."""
+        for index, (_, candidate) in enumerate(self._idle):
+            if candidate is worker:
+                self._remove(index)
+                task = asyncio.ensure_future(worker.close())
+                self._closing.add(task)
+                task.add_done_callback(self._closing.discard)
+                return
+
+    async def _checkout(self, key: Tuple[Any, ...]) -> Optional[_CodexWorker]:
+        """Return the most recently used responsive idle worker for `key`."""
+        while True:
+            for index in range(len(self._idle) - 1, -1, -1):
+                if self._idle[index][0] == key:
+                    worker = self._remove(index)
+                    break
+            else:
+                return None
+
+            if worker.alive:
+                try:
+                    await asyncio.wait_for(
+                        worker.session.send_ping(), timeout=_MCP_PING_TIMEOUT
+                    )
+                    return worker
+                except Exception as exc:  # noqa: BLE001
+                    logger.debug("Discarding unresponsive Codex MCP session: %r", exc)
+            await worker.close()
+
+    @contextlib.asynccontextmanager
+    async def acquire(
+        self,
+        key: Tuple[Any, ...],
+        open_session: Callable[[], AsyncContextManager[Any]],
+        max_idle: int,
+    ) -> AsyncIterator[_CodexWorker]:
+        """
+        Yield an idle worker for `key`, starting a new one if none is available.
+
+        Args:
+            key: Hashable launch parameters identifying compatible sessions
+            open_session: Factory returning an initialized session context
+            max_idle: Maximum idle workers kept across all keys (0 disables reuse)
+        """
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            # Sessions are bound to the loop that created them
+            self._idle = []
+            self._expiry = {}
+            self._loop = loop
+
+        worker = await self._checkout(key)
+        if worker is None:
+            worker = _CodexWorker(open_session)
+            await worker.start()
+
+        try:
+            yield worker
+        except BaseException:
+            await worker.close()
+            raise
+
+        if not worker.alive or max_idle <= 0:
+            await worker.close()
+            return
+
+        self._idle.append((key, worker))
+        self._expiry[worker] = loop.call_later(_MCP_IDLE_TTL, self._expire, worker)
+        while len(self._idle) > max_idle:
+            await self._remove(0).close()
+
+    async def close(self) -> None:
+        """Close all idle workers."""
+        while self._idle:
+            await self._remove(0).close()
+        if self._closing:
+            await asyncio.gather(*self._closing, return_exceptions=True)
+
+
+# Shared pool of Codex MCP sessions; see BridgeConfig.mcp_pool_size
+codex_pool = CodexWorkerPool()
+
 
 async def invoke_codex_mcp(
     prompt: str,
@@ -215,7 +831,7 @@ async def invoke_codex_mcp(
     model_max_output_tokens: int = 100000,
     tools_web_search: bool = False,
     timeout: int = 3600,
-) -> Tuple[str, str]:
+) -> Tuple[str, bytes]:
     """
     Invoke Codex via its MCP server interface using a non-interactive stdio client.
 
@@ -380,7 +996,8 @@ async def invoke_codex_mcp(
     ) -> None:  # type: ignore[name-defined]
         logger.debug("[codex-mcp][%s] %s", params.level, params.data)
 
-    try:
+    @contextlib.asynccontextmanager
+    async def _open_session() -> AsyncIterator[ClientSession]:
         async with stdio_client(server) as (read_stream, write_stream):
             async with ClientSession(
                 read_stream,
@@ -391,93 +1008,104 @@ async def invoke_codex_mcp(
             ) as session:  # type: ignore[arg-type]
                 # Initialize session
                 await session.initialize()
+                yield session
+
+    async def _call_codex(worker: _CodexWorker) -> Tuple[str, bytes]:
+        session = worker.session
+
+        # Discover tools once per Codex process
+        if worker.tool is None:
+            tools_result = await session.list_tools()
+            worker.tool = _choose_tool(tools_result.tools)
+        tool = worker.tool
+
+        # Build arguments using tool input schema (prompt only)
+        input_schema = tool.inputSchema if isinstance(tool.inputSchema, dict) else {}
+
+        prompt_key = _find_key(
+            input_schema,
+            [
+                "prompt",
+                "instruction",
+                "input",
+                "task",
+                "query",
+                "message",
+                "content",
+            ],
+        )
 
-                # Discover tools
-                tools_result = await session.list_tools()
-                tool = _choose_tool(tools_result.tools)
+        args_map: Dict[str, Any] = {}
+        if prompt_key is not None:
+            args_map[prompt_key] = prompt
+        else:
+            # If schema doesn't specify, try a common default
+            args_map["prompt"] = prompt
+
+        # Note: All sandbox/approval/effort settings are configured
+        # at the Codex MCP process level via CLI flags above.
+        # We only pass the prompt to the selected tool to keep
+        # interactions simple and consistent.
+
+        # Call the tool with an explicit request-level timeout
+        result = await session.call_tool(
+            tool.name,
+            arguments=args_map,
+            read_timeout_seconds=timedelta(seconds=timeout) if timeout else None,
+        )
 
-                # Build arguments using tool input schema (prompt only)
-                input_schema = (
-                    tool.inputSchema if isinstance(tool.inputSchema, dict) else {}
-                )
+        if result.isError:
+            raise RuntimeError("Codex MCP tool call returned an error")
 
-                prompt_key = _find_key(
-                    input_schema,
-                    [
-                        "prompt",
-                        "instruction",
-                        "input",
-                        "task",
-                        "query",
-                        "message",
-                        "content",
-                    ],
-                )
+        # Extract text content
+        texts: List[str] = []
+        for item in result.content or []:
+            # Prefer explicit content type
+            if isinstance(item, mcp_types.TextContent):
+                texts.append(item.text)
+                continue
 
-                args_map: Dict[str, Any] = {}
-                if prompt_key is not None:
-                    args_map[prompt_key] = prompt
-                else:
-                    # If schema doesn't specify, try a common default
-                    args_map["prompt"] = prompt
-
-                # Note: All sandbox/approval/effort settings are configured
-                # at the Codex MCP process level via CLI flags above.
-                # We only pass the prompt to the selected tool to keep
-                # interactions simple and consistent.
-
-                # Call the tool with an explicit request-level timeout
-                result = await session.call_tool(
-                    tool.name,
-                    arguments=args_map,
-                    read_timeout_seconds=(
-                        timedelta(seconds=timeout) if timeout else None
-                    ),
-                )
+            # Attempt to coerce other content types to text safely
+            as_dict: Dict[str, Any] = {}
+
+            model_dump = getattr(item, "model_dump", None)
+            if callable(model_dump):
+                try:
+                    dumped = model_dump()
+                    if isinstance(dumped, dict):
+                        as_dict = dumped
+                except Exception as exc:  # noqa: BLE001
+                    # Log and proceed without halting the whole operation
+                    logger.debug(
+                        "Failed to model_dump MCP content item %r: %s",
+                        item,
+                        exc,
+                    )
+
+            if isinstance(as_dict, dict):
+                text_value = as_dict.get("text")
+                if text_value is not None:
+                    try:
+                        texts.append(str(text_value))
+                    except Exception as exc:  # noqa: BLE001
+                        logger.debug(
+                            "Failed to convert text field to str for " "item %r: %s",
+                            item,
+                            exc,
+                        )
+
+        stdout_text = "\n".join([t for t in texts if t])
+        return stdout_text, b""
 
-                if result.isError:
-                    raise RuntimeError("Codex MCP tool call returned an error")
-
-                # Extract text content
-                texts: List[str] = []
-                for item in result.content or []:
-                    # Prefer explicit content type
-                    if isinstance(item, mcp_types.TextContent):
-                        texts.append(item.text)
-                        continue
-
-                    # Attempt to coerce other content types to text safely
-                    as_dict: Dict[str, Any] = {}
-
-                    model_dump = getattr(item, "model_dump", None)
-                    if callable(model_dump):
-                        try:
-                            dumped = model_dump()
-                            if isinstance(dumped, dict):
-                                as_dict = dumped
-                        except Exception as exc:  # noqa: BLE001
-                            # Log and proceed without halting the whole operation
-                            logger.debug(
-                                "Failed to model_dump MCP content item %r: %s",
-                                item,
-                                exc,
-                            )
-
-                    if isinstance(as_dict, dict):
-                        text_value = as_dict.get("text")
-                        if text_value is not None:
-                            try:
-                                texts.append(str(text_value))
-                            except Exception as exc:  # noqa: BLE001
-                                logger.debug(
-                                    "Failed to convert text field to str for "
-                                    "item %r: %s",
-                                    item,
-                                    exc,
-                                )
-
-                stdout_text = "\n".join([t for t in texts if t])
-                return stdout_text, ""
+    try:
+        # Reuse a pooled Codex MCP session launched with identical parameters
+        pooled_session = codex_pool.acquire(
+            (command, tuple(args), working_directory),
+            _open_session,
+            config.mcp_pool_size,
+        )
+        async with _get_codex_semaphore(), pooled_session as worker:
+            return await _call_codex(worker)
     except FileNotFoundError:
         raise RuntimeError(
             "codex command not found. Please ensure OpenAI Codex CLI is installed: "
@@ -494,6 +1122,190 @@ async def invoke_codex_mcp(
         raise RuntimeError(f"Codex MCP execution failed: {exc}")
 
 
+# Marker opening each task's section in a batched Codex response
+_BATCH_TASK_MARKER = "--[=[TASK {index}]=]--"
+
+_Invoker = Callable[..., Awaitable[Tuple[str, bytes]]]
+
+
+def _build_batch_prompt(prompts: List[str]) -> str:
+    """Combine several task prompts into one Codex prompt with per-task markers."""
+    display_markers = [
+        _escape_delimiter_for_display(_BATCH_TASK_MARKER.format(index=i))
+        for i in range(1, len(prompts) + 1)
+    ]
+    sections = [
+        f"You are given {len(prompts)} independent tasks. Complete each task "
+        f"separately and in order. Begin your response to each task with a line "
+        f"containing only its marker ({display_markers[0]} for task 1, "
+        f"{display_markers[1]} for task 2, and so on), then respond exactly as "
+        f"that task instructs. "
+        f"Note: In this instruction, '[' and ']' are escaped with backslashes; "
+        f"do not include backslashes in the actual markers in your output."
+    ]
+    for i, (marker, prompt) in enumerate(zip(display_markers, prompts), start=1):
+        sections.append(f"Task {i} (marker {marker}):\n{prompt}")
+    return "\n\n".join(sections)
+
+
+def _split_batch_output(stdout: str, count: int) -> List[Optional[str]]:
+    """
+    Split a batched Codex response into per-task sections.
+
+    Each section runs from the end of its task marker to the start of the
+    next task's marker; a task whose marker is missing maps to None.
+    """
+    positions: List[Optional[Tuple[int, int]]] = []
+    search_from = 0
+    for i in range(1, count + 1):
+        marker = _BATCH_TASK_MARKER.format(index=i)
+        idx = stdout.find(marker, search_from)
+        if idx == -1:
+            positions.append(None)
+            continue
+        positions.append((idx, idx + len(marker)))
+        search_from = idx + len(marker)
+
+    sections: List[Optional[str]] = []
+    for i, position in enumerate(positions):
+        if position is None:
+            sections.append(None)
+            continue
+        end = next(
+            (p[0] for p in positions[i + 1 :] if p is not None),
+            len(stdout),
+        )
+        sections.append(stdout[position[1] : end])
+    return sections
+
+
+class _DelegationBatcher:
+    """
+    Coalesces delegations that arrive within a short window and share the same
+    Codex configuration into a single Codex invocation.
+
+    Batching is off unless CODEX_BATCH_WINDOW_MS is set. The combined prompt
+    asks Codex to open each task's response with a numbered marker, and the
+    response is split on those markers so each caller parses only its own
+    section. Every caller in a batch shares the invocation's stderr and errors.
+    """
+
+    def __init__(self) -> None:
+        self._pending: Dict[
+            Tuple[Any, ...], List[Tuple[str, "asyncio.Future[Tuple[str, bytes]]"]]
+        ] = {}
+        self._flushes: Set["asyncio.Task[None]"] = set()
+
+    async def submit(
+        self,
+        invoker: _Invoker,
+        prompt: str,
+        working_directory: str,
+        approval_policy: str,
+        sandbox_mode: str,
+        task_complexity: Literal["minimal", "low", "medium", "high"] = "medium",
+        allow_write: bool = True,
+        model_max_output_tokens: int = 100000,
+        tools_web_search: bool = False,
+    ) -> Tuple[str, bytes]:
+        """
+        Run `prompt` through `invoker`, possibly batched with concurrent calls.
+
+        Takes the same arguments as the invokers and returns (stdout, stderr),
+        where stdout is this task's section of a batched response.
+        """
+        window = config.batch_window
+        if window <= 0:
+            return await invoker(
+                prompt,
+                working_directory,
+                approval_policy,
+                sandbox_mode,
+                task_complexity,
+                allow_write,
+                model_max_output_tokens=model_max_output_tokens,
+                tools_web_search=tools_web_search,
+            )
+
+        loop = asyncio.get_running_loop()
+        key = (
+            loop,
+            invoker,
+            working_directory,
+            approval_policy,
+            sandbox_mode,
+            task_complexity,
+            allow_write,
+            model_max_output_tokens,
+            tools_web_search,
+        )
+
+        async def _invoke(batch_prompt: str) -> Tuple[str, bytes]:
+            return await invoker(
+                batch_prompt,
+                working_directory,
+                approval_policy,
+                sandbox_mode,
+                task_complexity,
+                allow_write,
+                model_max_output_tokens=model_max_output_tokens,
+                tools_web_search=tools_web_search,
+            )
+
+        future: "asyncio.Future[Tuple[str, bytes]]" = loop.create_future()
+        batch = self._pending.get(key)
+        if batch is None:
+            batch = self._pending[key] = []
+            task = loop.create_task(self._flush(key, window, _invoke))
+            self._flushes.add(task)
+            task.add_done_callback(self._flushes.discard)
+        batch.append((prompt, future))
+        return await future
+
+    async def _flush(
+        self,
+        key: Tuple[Any, ...],
+        window: float,
+        invoke: Callable[[str], Awaitable[Tuple[str, bytes]]],
+    ) -> None:
+        await asyncio.sleep(window)
+        # Drop callers that were cancelled while the window was open
+        batch = [item for item in self._pending.pop(key, []) if not item[1].done()]
+        if not batch:
+            return
+
+        try:
+            if len(batch) == 1:
+                stdout, stderr = await invoke(batch[0][0])
+                sections: List[Optional[str]] = [stdout]
+            else:
+                prompts = [prompt for prompt, _ in batch]
+                stdout, stderr = await invoke(_build_batch_prompt(prompts))
+                sections = _split_batch_output(stdout, len(batch))
+        except Exception as exc:  # noqa: BLE001
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(exc)
+            return
+
+        for index, ((_, future), section) in enumerate(zip(batch, sections), start=1):
+            if future.done():
+                continue
+            if section is None:
+                future.set_exception(
+                    RuntimeError(
+                        f"Batched Codex response is missing the section for "
+                        f"task {index} of {len(batch)}"
+                    )
+                )
+            else:
+                future.set_result((section, stderr))
+
+
+# Shared batcher used by codex_delegate
+delegation_batcher = _DelegationBatcher()
+
+
 def _extract_wrapped_content(
     text: str, start_delimiter: str, end_delimiter: str
 ) -> Optional[str]:
@@ -509,15 +1321,18 @@ def _extract_wrapped_content(
     Returns:
         Content between delimiters, or None if not found properly
     """
-    # Find the first occurrence of the start delimiter
+    # Search the str directly: CPython stores ASCII/latin-1 text as one byte
+    # per character and str.find uses the same fastsearch as bytes.find, so
+    # encoding to UTF-8 first would only add a full copy of the output
     start_idx = text.find(start_delimiter)
     if start_idx == -1:
         return None
 
-    # Find the last occurrence of the end delimiter after the start delimiter
+    # Find the last occurrence of the end delimiter after the start delimiter;
+    # bounding the reverse scan keeps it from re-reading the preamble
     search_start = start_idx + len(start_delimiter)
-    end_idx = text.rfind(end_delimiter)
-    if end_idx == -1 or end_idx < search_start:
+    end_idx = text.rfind(end_delimiter, search_start)
+    if end_idx == -1:
         return None
 
     # Extract content between delimiters
@@ -532,15 +1347,29 @@ def _extract_after_delimiter(text: str, delimiter: str) -> str:
     If the delimiter is not found, returns the original text unchanged.
     Leading newlines/spaces after the delimiter are stripped.
     """
+    extracted = _find_after_delimiter(text, delimiter)
+    return text if extracted is None else extracted
+
+
+def _find_after_delimiter(text: str, delimiter: str) -> Optional[str]:
+    """
+    Like _extract_after_delimiter, but return None when the delimiter is
+    missing so callers can test for presence without a second scan.
+    """
     idx = text.find(delimiter)
     if idx == -1:
-        return text
-    # Move past delimiter
-    after = text[idx + len(delimiter) :]
-    # Strip all leading whitespace characters
-    return after.lstrip()
+        return None
+    # Skip past the delimiter and any leading whitespace, then slice once
+    # \s* matches the empty string, so match() never returns None here
+    start = _WS_RE.match(text, idx + len(delimiter)).end()  # type: ignore[union-attr]
+    return text[start:]
+
 
+# Translation table escaping square brackets in a single pass
+_ESCAPE_TABLE = str.maketrans({"[": r"\[", "]": r"\]"})
 
+
+@functools.lru_cache(maxsize=64)
 def _escape_delimiter_for_display(delimiter: str) -> str:
     """
     Return a display-safe representation of a delimiter for inclusion in
@@ -551,7 +1380,59 @@ def _escape_delimiter_for_display(delimiter: str) -> str:
     which prevents accidental early recognition when using Lua-style long
     bracket delimiters like "--[=[" and "]=]--".
     """
-    return delimiter.replace("[", r"\[").replace("]", r"\]")
+    return delimiter.translate(_ESCAPE_TABLE)
+
+
+def _detect_output_type(text: str) -> str:
+    """
+    Auto-detect the output type (diff, code, or explanation) in one pass.
+
+    A diff requires both '--- a/' and '+++ b/' headers and takes precedence;
+    otherwise two or more code fences or any code keyword mean code.
+    """
+    has_diff_a = has_diff_b = has_keyword = False
+    fence_count = 0
+
+    for match in _DETECT_RE.finditer(text):
+        group = match.lastindex
+        if group == 1:
+            has_diff_a = True
+        elif group == 2:
+            has_diff_b = True
+        elif group == 3:
+            fence_count += 1
+        else:
+            has_keyword = True
+
+        if has_diff_a and has_diff_b:
+            return "diff"
+
+    if fence_count >= 2 or has_keyword:
+        return "code"
+    return "explanation"
+
+
+@functools.lru_cache(maxsize=64)
+def _get_delimiter_instruction(start_delimiter: str, end_delimiter: str) -> str:
+    """
+    Return the prompt instruction asking Codex to wrap its final deliverable
+    between the given delimiters.
+
+    Escaped delimiters are used in the instruction text to avoid accidental
+    early detection if the model echoes the instruction. The model should use
+    the actual (unescaped) delimiters in its output.
+    """
+    display_start = _escape_delimiter_for_display(start_delimiter)
+    display_end = _escape_delimiter_for_display(end_delimiter)
+    return (
+        f"Please wrap your final deliverable content between "
+        f"{display_start} and {display_end} delimiters. "
+        f"Place any reasoning, explanation, or process details before the "
+        f"start delimiter, and put only the final code, analysis, or requested "
+        f"output between the delimiters. "
+        f"Note: In this instruction, '[' and ']' are escaped with backslashes; "
+        f"do not include backslashes in the actual delimiters in your output."
+    )
 
 
 def parse_codex_output(
@@ -565,6 +1446,12 @@ def parse_codex_output(
     """
     Parse Codex CLI output into structured JSON.
 
+    Results are memoized in an LRU cache keyed by a digest of stdout and the
+    parsing options, so re-parsing identical output is a dict lookup. The
+    cache holds at most 256 entries and 16M characters of extracted content
+    in total; least recently used entries are evicted first. Callers always
+    receive a fresh copy and may mutate it freely.
+
     Args:
         stdout: Codex CLI standard output
         output_format: Expected output format
@@ -576,6 +1463,45 @@ def parse_codex_output(
     Returns:
         Structured parsing result
     """
+    if not config.parse_cache:
+        return _parse_codex_output_uncached(
+            stdout, output_format, delimiter, start_delimiter, end_delimiter, strict
+        )
+
+    digest = hashlib.blake2b(
+        stdout.encode("utf-8", errors="surrogatepass"), digest_size=16
+    ).hexdigest()
+    key = (
+        digest,
+        output_format,
+        delimiter,
+        start_delimiter,
+        end_delimiter,
+        strict,
+        FINAL_OUTPUT_DELIMITER,
+        config.max_error_content,
+    )
+
+    cached = _parse_cache.get(key)
+    if cached is not None:
+        return dict(cached)
+
+    result = _parse_codex_output_uncached(
+        stdout, output_format, delimiter, start_delimiter, end_delimiter, strict
+    )
+    _parse_cache.put(key, result)
+    return dict(result)
+
+
+def _parse_codex_output_uncached(
+    stdout: str,
+    output_format: str,
+    delimiter: Optional[str],
+    start_delimiter: Optional[str],
+    end_delimiter: Optional[str],
+    strict: Optional[bool],
+) -> Dict[str, Any]:
+    """Parse Codex output without consulting the memoization cache."""
     # Default delimiters and strict mode
     default_start_delimiter = "--[=["
     default_end_delimiter = "]=]--"
@@ -596,8 +1522,9 @@ def parse_codex_output(
             has_delimiter = True
     elif delimiter is not None:
         # Single delimiter extraction for backward compatibility
-        if delimiter in stdout:
-            processed = _extract_after_delimiter(stdout, delimiter)
+        extracted_content = _find_after_delimiter(stdout, delimiter)
+        if extracted_content is not None:
+            processed = extracted_content
             has_delimiter = True
     else:
         # Use default wrapper delimiters
@@ -609,8 +1536,9 @@ def parse_codex_output(
             has_delimiter = True
         else:
             # Fallback to legacy single delimiter if present
-            if FINAL_OUTPUT_DELIMITER in stdout:
-                processed = _extract_after_delimiter(stdout, FINAL_OUTPUT_DELIMITER)
+            extracted_content = _find_after_delimiter(stdout, FINAL_OUTPUT_DELIMITER)
+            if extracted_content is not None:
+                processed = extracted_content
                 has_delimiter = True
 
     # Check strict mode
@@ -636,21 +1564,10 @@ def parse_codex_output(
             ),
             "expected_delimiters": expected_delimiters,
             "format": output_format,
-            "content": stdout.strip(),
+            "content": _truncate_error_content(stdout.strip()),
         }
 
-    # Auto-detect output type
-    output_type = "explanation"  # Default type
-
-    if "--- a/" in processed and "+++ b/" in processed:
-        output_type = "diff"
-    elif "```" in processed and processed.count("```") >= 2:
-        output_type = "code"
-    elif any(
-        keyword in processed.lower()
-        for keyword in ["file:", "class ", "function ", "def ", "import "]
-    ):
-        output_type = "code"
+    output_type = _detect_output_type(processed)
 
     return {
         "status": "success",
@@ -661,6 +1578,28 @@ def parse_codex_output(
     }
 
 
+def _truncate_error_content(text: str) -> str:
+    """
+    Bound text included in error responses to the last
+    `config.max_error_content` characters, where failures usually surface.
+    """
+    limit = config.max_error_content
+    if len(text) <= limit:
+        return text
+    return f"...(truncated {len(text) - limit} chars)\n" + text[len(text) - limit :]
+
+
+def _truncate_error_message(message: str) -> str:
+    """
+    Bound an exception message to its first `config.max_error_content`
+    characters, keeping the prefix that says what failed (e.g. the exit code).
+    """
+    limit = config.max_error_content
+    if len(message) <= limit:
+        return message
+    return message[:limit] + f"\n...(truncated {len(message) - limit} chars)"
+
+
 @mcp.tool()
 async def codex_delegate(
     task_description: str,
@@ -729,7 +1668,7 @@ async def codex_delegate(
     mode_notice: Optional[Dict[str, Union[str, List[str]]]] = None
 
     # Check if write operations are allowed (default: False for safety)
-    allow_write = os.environ.get("CODEX_ALLOW_WRITE", "false").lower() == "true"
+    allow_write = config.allow_write
 
     if not allow_write and sandbox_mode != "read-only":
         effective_sandbox_mode = "read-only"
@@ -754,6 +1693,7 @@ async def codex_delegate(
         }
 
     # 2. Validate working directory
+    dde = _get_dde()
     if not dde.validate_working_directory(working_directory):
         error_result: Dict[str, Any] = {
             "status": "error",
@@ -804,47 +1744,18 @@ async def codex_delegate(
     )
 
     # Build format-specific instruction and prepend delimiter instruction to prompt
-    if effective_output_format == "diff":
-        format_instruction = (
-            "Inside the wrapper, output a unified diff only in git patch format "
-            "starting with '--- a/' and '+++ b/' headers. Do not include code "
-            "fences, comments, or extra text."
-        )
-    elif effective_output_format == "full_file":
-        format_instruction = (
-            "Inside the wrapper, output only the complete final file content(s) "
-            "without any code fences or commentary. If multiple files, separate "
-            "each with a line 'File: <path>' followed by the file content."
-        )
-    else:  # explanation
-        format_instruction = (
-            "Inside the wrapper, output only the explanation as plain text, "
-            "with no code fences or extraneous headers."
-        )
-
-    display_start = _escape_delimiter_for_display(start_delimiter)
-    display_end = _escape_delimiter_for_display(end_delimiter)
-
-    # Note: We intentionally use escaped delimiters in the instruction text to
-    # avoid accidental early detection if the model echoes the instruction.
-    # The model should use the actual (unescaped) delimiters in its output.
-    delimiter_instruction = (
-        f"Please wrap your final deliverable content between "
-        f"{display_start} and {display_end} delimiters. "
-        f"Place any reasoning, explanation, or process details before the "
-        f"start delimiter, and put only the final code, analysis, or requested "
-        f"output between the delimiters. "
-        f"Note: In this instruction, '[' and ']' are escaped with backslashes; "
-        f"do not include backslashes in the actual delimiters in your output."
+    format_instruction = _FORMAT_INSTRUCTIONS.get(
+        effective_output_format, _FORMAT_INSTRUCTIONS["explanation"]
     )
+    delimiter_instruction = _get_delimiter_instruction(start_delimiter, end_delimiter)
 
     try:
         # 5. Invoke Codex (default MCP backend unless legacy CLI forced)
-        backend = _get_codex_backend()
-        invoker = invoke_codex_mcp if backend == "mcp" else invoke_codex_cli
+        invoker = invoke_codex_mcp if config.backend == "mcp" else invoke_codex_cli
 
-        stdout, stderr = await invoker(
-            f"{format_instruction}\n\n{delimiter_instruction}\n\n{codex_prompt}",
+        stdout, stderr = await delegation_batcher.submit(
+            invoker,
+            "\n\n".join((format_instruction, delimiter_instruction, codex_prompt)),
             working_directory,
             approval_policy,
             effective_sandbox_mode,
@@ -885,9 +1796,9 @@ async def codex_delegate(
         if mode_notice:
             result["operation_mode"] = mode_notice
 
-        # If there is stderr, include it as well
-        if stderr.strip():
-            result["stderr"] = stderr.strip()
+        # If there is stderr, include it as well (decoded only here)
+        if stderr and stderr.strip():
+            result["stderr"] = stderr.decode("utf-8", errors="replace").strip()
 
         return json.dumps(result, indent=2, ensure_ascii=False)
 
@@ -895,7 +1806,7 @@ async def codex_delegate(
         # Handle execution errors
         error_result = {
             "status": "error",
-            "message": str(e),
+            "message": _truncate_error_message(str(e)),
             "error_type": type(e).__name__,
             "working_directory": working_directory,
             "approval_policy": approval_policy,
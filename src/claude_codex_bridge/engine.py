@@ -6,6 +6,9 @@ Responsible for analyzing tasks and deciding whether and how to delegate to Code
 
 import os
 
+# Sensitive system directories that must never be used as a working directory
+DANGEROUS_PATHS = ("/etc", "/usr/bin", "/bin", "/sbin", "/root")
+
 
 class DelegationDecisionEngine:
     """
@@ -13,7 +16,11 @@ class DelegationDecisionEngine:
     """
 
     def __init__(self) -> None:
-        pass
+        # System directories do not move at runtime, so resolve them once
+        # instead of on every validation
+        self._dangerous_real_paths = tuple(
+            os.path.realpath(path) for path in DANGEROUS_PATHS
+        )
 
     def should_delegate(self, task_description: str) -> bool:
         """
@@ -64,20 +71,17 @@ class DelegationDecisionEngine:
         if not os.path.isabs(directory):
             return False
 
-        # Ensure the directory exists
-        if not os.path.exists(directory):
-            return False
-
-        # Ensure it is a directory and not a file
+        # Ensure the directory exists and is a directory, not a file
+        # (isdir is False for missing paths, so one stat covers both)
         if not os.path.isdir(directory):
             return False
 
-        # Basic security check - prevent access to sensitive system directories
-        dangerous_paths = ["/etc", "/usr/bin", "/bin", "/sbin", "/root"]
+        # Basic security check - prevent access to sensitive system directories.
+        # The result is deliberately not cached: a symlink may be retargeted
+        # between calls, so the candidate path is resolved every time.
         normalized_path = os.path.realpath(directory)
 
-        for dangerous in dangerous_paths:
-            dangerous_real = os.path.realpath(dangerous)
+        for dangerous_real in self._dangerous_real_paths:
             try:
                 if (
                     os.path.commonpath([normalized_path, dangerous_real])
@@ -8,5 +8,16 @@ without requiring per-file sys.path manipulation.
 import os
 import sys
 
+import pytest
+
 # Add src directory to Python path for testing
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+
+@pytest.fixture(autouse=True)
+def _reset_bridge_config():
+    """Re-read bridge settings after each test so patched env does not leak."""
+    yield
+    from claude_codex_bridge import bridge_server
+
+    bridge_server.reload_config()
@@ -0,0 +1,29 @@
+"""Stand-ins for Codex CLI processes returned by a patched _spawn_codex_process."""
+
+import asyncio
+
+
+def stream_reader(data: bytes) -> asyncio.StreamReader:
+    """Return a stream reader that yields `data` and then EOF."""
+    reader = asyncio.StreamReader()
+    reader.feed_data(data)
+    reader.feed_eof()
+    return reader
+
+
+class DummyProcess:
+    """Process that has already exited with the given output."""
+
+    def __init__(self, returncode: int = 0, stdout: bytes = b"ok", stderr: bytes = b""):
+        self.returncode = returncode
+        self.stdout = stream_reader(stdout)
+        self.stderr = stream_reader(stderr)
+
+    def terminate(self):  # pragma: no cover - simple stub
+        pass
+
+    async def wait(self):  # pragma: no cover - simple stub
+        return
+
+    def kill(self):  # pragma: no cover - simple stub
+        pass
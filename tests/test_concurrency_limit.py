@@ -0,0 +1,61 @@
+"""Tests for the global cap on concurrent Codex CLI processes."""
+
+import asyncio
+import os
+import unittest
+from unittest.mock import patch
+
+from claude_codex_bridge import bridge_server
+from claude_codex_bridge.bridge_server import invoke_codex_cli
+from process_stubs import DummyProcess
+
+
+class SlowProcess(DummyProcess):
+    def __init__(self, tracker):
+        super().__init__(stdout=b"done")
+        self._tracker = tracker
+
+    async def wait(self):
+        self._tracker["running"] += 1
+        self._tracker["peak"] = max(self._tracker["peak"], self._tracker["running"])
+        await asyncio.sleep(0.01)
+        self._tracker["running"] -= 1
+
+
+class TestConcurrencyLimit(unittest.IsolatedAsyncioTestCase):
+    async def test_concurrent_invocations_are_capped(self):
+        tracker = {"running": 0, "peak": 0}
+
+        async def fake_subprocess_exec(*cmd, **kwargs):
+            return SlowProcess(tracker)
+
+        with patch.dict(os.environ, {"CODEX_MAX_CONCURRENCY": "2"}):
+            bridge_server.reload_config()
+            with patch.object(
+                bridge_server, "_spawn_codex_process", side_effect=fake_subprocess_exec
+            ):
+                results = await asyncio.gather(
+                    *[
+                        invoke_codex_cli(
+                            prompt=f"task {i}",
+                            working_directory="/tmp",
+                            approval_policy="on-failure",
+                            sandbox_mode="read-only",
+                            allow_write=False,
+                        )
+                        for i in range(5)
+                    ]
+                )
+
+        self.assertEqual(len(results), 5)
+        self.assertEqual(tracker["peak"], 2)
+
+    def test_invalid_limit_falls_back_to_default(self):
+        with patch.dict(os.environ, {"CODEX_MAX_CONCURRENCY": "many"}):
+            self.assertEqual(bridge_server._get_max_concurrency(), 4)
+        with patch.dict(os.environ, {"CODEX_MAX_CONCURRENCY": "0"}):
+            self.assertEqual(bridge_server._get_max_concurrency(), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
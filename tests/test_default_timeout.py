@@ -6,26 +6,9 @@ import tempfile
 import unittest
 from unittest.mock import patch
 
+from claude_codex_bridge import bridge_server
 from claude_codex_bridge.bridge_server import invoke_codex_cli
-
-
-class DummyProcess:
-    def __init__(self, returncode: int = 0, stdout: bytes = b"ok", stderr: bytes = b""):
-        self.returncode = returncode
-        self._stdout = stdout
-        self._stderr = stderr
-
-    async def communicate(self):
-        return self._stdout, self._stderr
-
-    def terminate(self):  # pragma: no cover - simple stub
-        pass
-
-    async def wait(self):  # pragma: no cover - simple stub
-        return
-
-    def kill(self):  # pragma: no cover - simple stub
-        pass
+from process_stubs import DummyProcess
 
 
 class TestDefaultTimeout(unittest.IsolatedAsyncioTestCase):
@@ -40,7 +23,7 @@ class TestDefaultTimeout(unittest.IsolatedAsyncioTestCase):
             return DummyProcess(returncode=0, stdout=b"done", stderr=b"")
 
         with patch.object(
-            asyncio, "create_subprocess_exec", side_effect=fake_subprocess_exec
+            bridge_server, "_spawn_codex_process", side_effect=fake_subprocess_exec
         ):
             with patch.object(asyncio, "wait_for", side_effect=fake_wait_for):
                 os.environ["CODEX_ALLOW_WRITE"] = "false"
@@ -0,0 +1,170 @@
+"""Tests for batching concurrent delegations into one Codex invocation."""
+
+import asyncio
+import json
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from claude_codex_bridge.bridge_server import (
+    _BATCH_TASK_MARKER,
+    _DelegationBatcher,
+    _split_batch_output,
+    codex_delegate,
+    reload_config,
+)
+
+
+def _marker(index):
+    return _BATCH_TASK_MARKER.format(index=index)
+
+
+class FakeInvoker:
+    """Records prompts and answers each batched task with its own section."""
+
+    def __init__(self, drop_task=None):
+        self.prompts = []
+        self._drop_task = drop_task
+
+    async def __call__(self, prompt, *args, **kwargs):
+        self.prompts.append(prompt)
+        count = prompt.count("Task ") or 1
+        if count == 1:
+            return f"answer for: {prompt}", b"warn"
+        parts = [
+            f"{_marker(i)}\nanswer {i}\n"
+            for i in range(1, count + 1)
+            if i != self._drop_task
+        ]
+        return "".join(parts), b"warn"
+
+
+def _submit(batcher, invoker, prompt, working_directory="/tmp"):
+    return batcher.submit(
+        invoker, prompt, working_directory, "on-failure", "read-only", "medium", False
+    )
+
+
+class TestDelegationBatcher(unittest.IsolatedAsyncioTestCase):
+    @patch.dict(os.environ, {"CODEX_BATCH_WINDOW_MS": "0"})
+    async def test_disabled_by_default_window(self):
+        reload_config()
+        batcher = _DelegationBatcher()
+        invoker = FakeInvoker()
+
+        results = await asyncio.gather(
+            _submit(batcher, invoker, "one"), _submit(batcher, invoker, "two")
+        )
+
+        self.assertEqual(invoker.prompts, ["one", "two"])
+        self.assertEqual(results[0], ("answer for: one", b"warn"))
+
+    @patch.dict(os.environ, {"CODEX_BATCH_WINDOW_MS": "20"})
+    async def test_concurrent_calls_share_one_invocation(self):
+        reload_config()
+        batcher = _DelegationBatcher()
+        invoker = FakeInvoker()
+
+        results = await asyncio.gather(
+            *[_submit(batcher, invoker, f"prompt {i}") for i in range(3)]
+        )
+
+        self.assertEqual(len(invoker.prompts), 1)
+        self.assertIn("prompt 2", invoker.prompts[0])
+        self.assertEqual(
+            [r[0].strip() for r in results], ["answer 1", "answer 2", "answer 3"]
+        )
+        self.assertTrue(all(r[1] == b"warn" for r in results))
+
+    @patch.dict(os.environ, {"CODEX_BATCH_WINDOW_MS": "20"})
+    async def test_different_configurations_are_not_batched(self):
+        reload_config()
+        batcher = _DelegationBatcher()
+        invoker = FakeInvoker()
+
+        await asyncio.gather(
+            _submit(batcher, invoker, "one", "/tmp/a"),
+            _submit(batcher, invoker, "two", "/tmp/b"),
+        )
+
+        self.assertEqual(sorted(invoker.prompts), ["one", "two"])
+
+    @patch.dict(os.environ, {"CODEX_BATCH_WINDOW_MS": "20"})
+    async def test_missing_section_fails_only_that_task(self):
+        reload_config()
+        batcher = _DelegationBatcher()
+        invoker = FakeInvoker(drop_task=2)
+
+        results = await asyncio.gather(
+            *[_submit(batcher, invoker, f"prompt {i}") for i in range(3)],
+            return_exceptions=True,
+        )
+
+        self.assertEqual(results[0][0].strip(), "answer 1")
+        self.assertIsInstance(results[1], RuntimeError)
+        self.assertEqual(results[2][0].strip(), "answer 3")
+
+    @patch.dict(os.environ, {"CODEX_BATCH_WINDOW_MS": "20"})
+    async def test_invoker_error_propagates_to_all_tasks(self):
+        reload_config()
+        batcher = _DelegationBatcher()
+
+        async def failing_invoker(prompt, *args, **kwargs):
+            raise RuntimeError("codex failed")
+
+        results = await asyncio.gather(
+            *[_submit(batcher, failing_invoker, f"prompt {i}") for i in range(2)],
+            return_exceptions=True,
+        )
+
+        self.assertTrue(all(isinstance(r, RuntimeError) for r in results))
+
+
+class TestSplitBatchOutput(unittest.TestCase):
+    def test_markers_with_common_prefix_are_distinct(self):
+        stdout = "".join(f"{_marker(i)}body {i}" for i in range(1, 11))
+
+        sections = _split_batch_output(stdout, 10)
+
+        self.assertEqual(sections[0], "body 1")
+        self.assertEqual(sections[9], "body 10")
+
+
+class TestCodexDelegateBatching(unittest.IsolatedAsyncioTestCase):
+    @patch.dict(
+        os.environ,
+        {
+            "CODEX_BATCH_WINDOW_MS": "20",
+            "CODEX_BACKEND": "cli",
+            "CODEX_ALLOW_WRITE": "false",
+        },
+    )
+    async def test_each_delegation_parses_its_own_section(self):
+        reload_config()
+
+        async def fake_invoke(prompt, *args, **kwargs):
+            return (
+                f"{_marker(1)}\n--[=[first result]=]--\n"
+                f"{_marker(2)}\n--[=[second result]=]--\n",
+                b"",
+            )
+
+        with patch(
+            "claude_codex_bridge.bridge_server.invoke_codex_cli",
+            side_effect=fake_invoke,
+        ) as mock_invoke:
+            with tempfile.TemporaryDirectory() as tmpdir:
+                raw_results = await asyncio.gather(
+                    codex_delegate(task_description="first", working_directory=tmpdir),
+                    codex_delegate(task_description="second", working_directory=tmpdir),
+                )
+
+        results = [json.loads(r) for r in raw_results]
+        self.assertEqual(mock_invoke.call_count, 1)
+        self.assertEqual(results[0]["content"], "first result")
+        self.assertEqual(results[1]["content"], "second result")
+
+
+if __name__ == "__main__":
+    unittest.main()
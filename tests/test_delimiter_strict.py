@@ -1,6 +1,8 @@
+import os
 import unittest
+from unittest.mock import patch
 
-from claude_codex_bridge.bridge_server import parse_codex_output
+from claude_codex_bridge.bridge_server import parse_codex_output, reload_config
 
 
 class TestDelimiterStrictMode(unittest.TestCase):
@@ -17,6 +19,18 @@ class TestDelimiterStrictMode(unittest.TestCase):
         self.assertEqual(result.get("status"), "error")
         self.assertEqual(result.get("error_type"), "final_output_delimiter_missing")
 
+    def test_strict_error_content_keeps_tail(self):
+        raw = "head " * 10 + "tail end"
+        with patch.dict(os.environ, {"CODEX_MAX_ERROR_CONTENT": "8"}):
+            reload_config()
+            result = parse_codex_output(raw, output_format="explanation", strict=True)
+        self.assertEqual(result.get("content"), "...(truncated 50 chars)\ntail end")
+
+    def test_short_strict_error_content_is_unchanged(self):
+        raw = "Short output."
+        result = parse_codex_output(raw, output_format="explanation", strict=True)
+        self.assertEqual(result.get("content"), raw)
+
 
 if __name__ == "__main__":
     unittest.main()
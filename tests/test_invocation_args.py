@@ -3,31 +3,13 @@ Tests for correct Codex CLI argument construction, ensuring prompts are
 passed after a `--` delimiter so leading dashes are treated as text.
 """
 
-import asyncio
 import os
 import unittest
 from unittest.mock import patch
 
+from claude_codex_bridge import bridge_server
 from claude_codex_bridge.bridge_server import invoke_codex_cli
-
-
-class DummyProcess:
-    def __init__(self, returncode: int = 0, stdout: bytes = b"ok", stderr: bytes = b""):
-        self.returncode = returncode
-        self._stdout = stdout
-        self._stderr = stderr
-
-    async def communicate(self):
-        return self._stdout, self._stderr
-
-    def terminate(self):
-        pass
-
-    async def wait(self):
-        return
-
-    def kill(self):
-        pass
+from process_stubs import DummyProcess
 
 
 class TestInvocationArgs(unittest.IsolatedAsyncioTestCase):
@@ -36,11 +18,10 @@ class TestInvocationArgs(unittest.IsolatedAsyncioTestCase):
 
         async def fake_subprocess_exec(*cmd, **kwargs):
             captured_args["cmd"] = list(cmd)
-            captured_args["cwd"] = kwargs.get("cwd")
             return DummyProcess(returncode=0, stdout=b"done", stderr=b"")
 
         with patch.object(
-            asyncio, "create_subprocess_exec", side_effect=fake_subprocess_exec
+            bridge_server, "_spawn_codex_process", side_effect=fake_subprocess_exec
         ):
             # Force read-only behavior to avoid write flags complicating the check
             os.environ["CODEX_ALLOW_WRITE"] = "false"
@@ -55,7 +36,7 @@ class TestInvocationArgs(unittest.IsolatedAsyncioTestCase):
             )
 
             self.assertEqual(stdout, "done")
-            self.assertEqual(stderr, "")
+            self.assertEqual(stderr, b"")
 
             cmd = captured_args["cmd"]
             # Ensure structure includes `--` before prompt
@@ -63,6 +44,9 @@ class TestInvocationArgs(unittest.IsolatedAsyncioTestCase):
             self.assertEqual(cmd[-2], "--")
             self.assertEqual(cmd[-1], prompt)
 
+            # The working directory reaches Codex via -C
+            self.assertEqual(cmd[cmd.index("-C") + 1], "/tmp")
+
     async def test_leading_dash_prompt_is_not_treated_as_flag(self):
         captured_args = {}
 
@@ -71,7 +55,7 @@ class TestInvocationArgs(unittest.IsolatedAsyncioTestCase):
             return DummyProcess(returncode=0, stdout=b"ok", stderr=b"")
 
         with patch.object(
-            asyncio, "create_subprocess_exec", side_effect=fake_subprocess_exec
+            bridge_server, "_spawn_codex_process", side_effect=fake_subprocess_exec
         ):
             os.environ["CODEX_ALLOW_WRITE"] = "false"
 
@@ -0,0 +1,43 @@
+"""Tests for output type auto-detection in parse_codex_output."""
+
+import unittest
+
+from claude_codex_bridge.bridge_server import (
+    _DETECTION_KEYWORDS,
+    _detect_output_type,
+)
+
+
+class TestOutputTypeDetection(unittest.TestCase):
+    def test_diff_requires_both_headers(self):
+        self.assertEqual(
+            _detect_output_type("--- a/foo.py\n+++ b/foo.py\n@@ -1 +1 @@\n"), "diff"
+        )
+        self.assertEqual(_detect_output_type("--- a/foo.py\nonly one"), "explanation")
+
+    def test_diff_takes_precedence_over_code_markers(self):
+        text = "import os\n```\n```\n--- a/x.py\n+++ b/x.py\n"
+        self.assertEqual(_detect_output_type(text), "diff")
+
+    def test_two_code_fences_mean_code(self):
+        self.assertEqual(_detect_output_type("```\nx = 1\n```"), "code")
+        self.assertEqual(_detect_output_type("only one ``` fence"), "explanation")
+
+    def test_keywords_are_case_insensitive(self):
+        self.assertEqual(_detect_output_type("File: src/app.py"), "code")
+        self.assertEqual(_detect_output_type("CLASS Foo"), "code")
+        self.assertEqual(_detect_output_type("see the profile: page"), "code")
+
+    def test_every_keyword_marks_code(self):
+        for keyword in _DETECTION_KEYWORDS:
+            with self.subTest(keyword=keyword):
+                self.assertEqual(_detect_output_type(f"see {keyword}x"), "code")
+
+    def test_plain_text_is_explanation(self):
+        self.assertEqual(
+            _detect_output_type("The module looks fine overall."), "explanation"
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,86 @@
+"""Tests for memoization of parse_codex_output results."""
+
+import os
+import unittest
+from unittest.mock import patch
+
+from claude_codex_bridge import bridge_server
+from claude_codex_bridge.bridge_server import parse_codex_output
+
+
+class TestParseCache(unittest.TestCase):
+    def setUp(self):
+        bridge_server._parse_cache.clear()
+
+    def tearDown(self):
+        bridge_server._parse_cache.clear()
+
+    def test_repeated_parse_hits_cache(self):
+        raw = "Preamble\n--[=[\ndef foo():\n    pass\n]=]--\n"
+
+        with patch.object(
+            bridge_server,
+            "_parse_codex_output_uncached",
+            wraps=bridge_server._parse_codex_output_uncached,
+        ) as mock_parse:
+            first = parse_codex_output(raw, output_format="explanation")
+            second = parse_codex_output(raw, output_format="explanation")
+
+        self.assertEqual(mock_parse.call_count, 1)
+        self.assertEqual(first, second)
+        self.assertEqual(first["type"], "code")
+
+    def test_returned_result_is_a_copy(self):
+        raw = "--[=[Plain explanation]=]--"
+
+        first = parse_codex_output(raw, output_format="explanation")
+        first["working_directory"] = "/tmp"
+        second = parse_codex_output(raw, output_format="explanation")
+
+        self.assertNotIn("working_directory", second)
+
+    def test_options_are_part_of_cache_key(self):
+        raw = "No delimiter present."
+
+        lenient = parse_codex_output(raw, output_format="explanation", strict=False)
+        strict = parse_codex_output(raw, output_format="explanation", strict=True)
+
+        self.assertEqual(lenient["status"], "success")
+        self.assertEqual(strict["status"], "error")
+
+    def test_cache_can_be_disabled(self):
+        raw = "--[=[Plain explanation]=]--"
+
+        with patch.dict(os.environ, {"CODEX_PARSE_CACHE": "0"}):
+            bridge_server.reload_config()
+            parse_codex_output(raw, output_format="explanation")
+
+        self.assertEqual(len(bridge_server._parse_cache), 0)
+
+    def test_cache_is_bounded_by_total_content(self):
+        with patch.object(bridge_server, "_PARSE_CACHE_MAX_CHARS", 100):
+            for i in range(5):
+                parse_codex_output(f"{i}" * 40, output_format="explanation")
+
+            self.assertEqual(len(bridge_server._parse_cache), 2)
+            self.assertEqual(bridge_server._parse_cache.chars, 80)
+
+    def test_output_larger_than_budget_is_not_cached(self):
+        with patch.object(bridge_server, "_PARSE_CACHE_MAX_CHARS", 10):
+            raw = "x" * 11
+            result = parse_codex_output(raw, output_format="explanation")
+
+        self.assertEqual(result["content"], raw)
+        self.assertEqual(len(bridge_server._parse_cache), 0)
+
+    def test_cache_is_bounded(self):
+        for i in range(bridge_server._PARSE_CACHE_MAXSIZE + 10):
+            parse_codex_output(f"output {i}", output_format="explanation")
+
+        self.assertEqual(
+            len(bridge_server._parse_cache), bridge_server._PARSE_CACHE_MAXSIZE
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,182 @@
+"""Tests for spawning the Codex CLI process off the event loop."""
+
+import asyncio
+import subprocess
+import sys
+import time
+import unittest
+from unittest.mock import patch
+
+from claude_codex_bridge import bridge_server
+from claude_codex_bridge.bridge_server import (
+    _collect_process_output,
+    _read_stream_tail,
+    _read_text_stream,
+    _spawn_codex_process,
+    _stop_codex_process,
+    invoke_codex_cli,
+)
+
+# Child that reports readiness, then exits cleanly on SIGINT
+_SIGINT_AWARE_CHILD = (
+    "import signal, sys, time\n"
+    "signal.signal(signal.SIGINT, lambda *_: sys.exit(130))\n"
+    "print('ready', flush=True)\n"
+    "time.sleep(30)\n"
+)
+
+# Child that ignores SIGINT and SIGTERM, so only SIGKILL stops it
+_STUBBORN_CHILD = (
+    "import signal, time\n"
+    "signal.signal(signal.SIGINT, signal.SIG_IGN)\n"
+    "signal.signal(signal.SIGTERM, signal.SIG_IGN)\n"
+    "print('ready', flush=True)\n"
+    "time.sleep(30)\n"
+)
+
+
+class TestProcessSpawn(unittest.IsolatedAsyncioTestCase):
+    async def test_output_and_exit_code_are_collected(self):
+        process = await _spawn_codex_process(
+            sys.executable,
+            "-c",
+            "import sys; print('out'); print('err', file=sys.stderr); sys.exit(3)",
+        )
+
+        stdout, stderr = await _collect_process_output(process)
+        process.close()
+
+        self.assertEqual(stdout.strip(), "out")
+        self.assertEqual(stderr.strip(), b"err")
+        self.assertEqual(process.returncode, 3)
+
+    async def test_missing_executable_raises_file_not_found(self):
+        with self.assertRaises(FileNotFoundError):
+            await _spawn_codex_process("definitely-not-a-real-codex-binary")
+
+    async def _wait_until_reaped(self, popen):
+        for _ in range(100):
+            if popen.returncode is not None:
+                return
+            await asyncio.sleep(0.02)
+        self.fail("abandoned child process was not reaped")
+
+    async def test_child_is_reaped_when_spawn_is_cancelled(self):
+        started = []
+        real_popen = subprocess.Popen
+
+        def slow_popen(*args, **kwargs):
+            time.sleep(0.2)
+            started.append(real_popen(*args, **kwargs))
+            return started[-1]
+
+        with patch.object(bridge_server.subprocess, "Popen", side_effect=slow_popen):
+            task = asyncio.create_task(
+                _spawn_codex_process(sys.executable, "-c", _SIGINT_AWARE_CHILD)
+            )
+            await asyncio.sleep(0.05)
+            task.cancel()
+            with self.assertRaises(asyncio.CancelledError):
+                await task
+
+            # Popen completes in its thread after the caller is gone
+            await asyncio.sleep(0.3)
+
+        self.assertEqual(len(started), 1)
+        await self._wait_until_reaped(started[0])
+
+    async def test_child_is_reaped_when_pipe_adoption_fails(self):
+        started = []
+        real_popen = subprocess.Popen
+
+        def recording_popen(*args, **kwargs):
+            started.append(real_popen(*args, **kwargs))
+            return started[-1]
+
+        loop = asyncio.get_running_loop()
+        with (
+            patch.object(
+                bridge_server.subprocess, "Popen", side_effect=recording_popen
+            ),
+            patch.object(loop, "connect_read_pipe", side_effect=OSError("boom")),
+        ):
+            with self.assertRaises(OSError):
+                await _spawn_codex_process(sys.executable, "-c", _SIGINT_AWARE_CHILD)
+
+        await self._wait_until_reaped(started[0])
+
+
+@unittest.skipIf(sys.platform == "win32", "POSIX signals only")
+class TestProcessStop(unittest.IsolatedAsyncioTestCase):
+    async def _spawn_ready(self, script):
+        process = await _spawn_codex_process(sys.executable, "-c", script)
+        self.assertEqual(await process.stdout.readline(), b"ready\n")
+        return process
+
+    async def test_sigint_is_tried_first(self):
+        process = await self._spawn_ready(_SIGINT_AWARE_CHILD)
+
+        await _stop_codex_process(process)
+
+        self.assertEqual(process.returncode, 130)
+        process.close()
+
+    async def test_escalates_to_kill(self):
+        process = await self._spawn_ready(_STUBBORN_CHILD)
+
+        with (
+            patch.object(bridge_server, "_SIGINT_GRACE", 0.1),
+            patch.object(bridge_server, "_TERMINATE_GRACE", 0.1),
+        ):
+            await _stop_codex_process(process)
+
+        self.assertEqual(process.returncode, -9)
+        process.close()
+
+    async def test_cli_timeout_stops_process(self):
+        spawned = []
+
+        async def spawn_child(*cmd, **kwargs):
+            process = await _spawn_codex_process(
+                sys.executable, "-c", _SIGINT_AWARE_CHILD
+            )
+            spawned.append(process)
+            return process
+
+        with patch.object(
+            bridge_server, "_spawn_codex_process", side_effect=spawn_child
+        ):
+            with self.assertRaises(asyncio.TimeoutError):
+                await invoke_codex_cli(
+                    prompt="Analyze code",
+                    working_directory="/tmp",
+                    approval_policy="on-failure",
+                    sandbox_mode="read-only",
+                    allow_write=False,
+                    timeout=0.5,
+                )
+
+        self.assertEqual(spawned[0].returncode, 130)
+
+
+class TestOutputStreaming(unittest.IsolatedAsyncioTestCase):
+    async def test_multibyte_characters_split_across_chunks(self):
+        reader = asyncio.StreamReader()
+        reader.feed_data("héllo ✓".encode("utf-8"))
+        reader.feed_eof()
+
+        # Read one byte at a time so multibyte sequences straddle chunks
+        with patch.object(bridge_server, "_READ_CHUNK_SIZE", 1):
+            self.assertEqual(await _read_text_stream(reader), "héllo ✓")
+
+    async def test_stream_tail_keeps_last_bytes(self):
+        reader = asyncio.StreamReader()
+        reader.feed_data(b"a" * 100)
+        reader.feed_data(b"b" * 10)
+        reader.feed_eof()
+
+        self.assertEqual(await _read_stream_tail(reader, 15), b"a" * 5 + b"b" * 10)
+
+
+if __name__ == "__main__":
+    unittest.main()
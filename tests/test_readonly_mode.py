@@ -7,7 +7,12 @@ import os
 import unittest
 from unittest.mock import patch
 
-from claude_codex_bridge.bridge_server import codex_delegate
+from claude_codex_bridge.bridge_server import (
+    _get_dynamic_instructions,
+    codex_delegate,
+    reload_config,
+)
+from claude_codex_bridge.engine import DelegationDecisionEngine
 
 
 class TestReadOnlyMode(unittest.IsolatedAsyncioTestCase):
@@ -27,16 +32,17 @@ class TestReadOnlyMode(unittest.IsolatedAsyncioTestCase):
 
     @patch.dict(os.environ, {"CODEX_ALLOW_WRITE": "false", "CODEX_BACKEND": "cli"})
     @patch("claude_codex_bridge.bridge_server.invoke_codex_cli")
-    @patch("claude_codex_bridge.bridge_server.dde.validate_working_directory")
-    @patch("claude_codex_bridge.bridge_server.dde.should_delegate")
+    @patch.object(DelegationDecisionEngine, "validate_working_directory")
+    @patch.object(DelegationDecisionEngine, "should_delegate")
     async def test_sandbox_mode_forced_to_readonly_when_write_disabled(
         self, mock_should_delegate, mock_validate_dir, mock_invoke_codex
     ):
         """Test that sandbox_mode is forced to read-only when write is disabled."""
+        reload_config()
         # Setup mocks
         mock_validate_dir.return_value = True
         mock_should_delegate.return_value = True
-        mock_invoke_codex.return_value = ("mock output", "")
+        mock_invoke_codex.return_value = ("mock output", b"")
 
         # Call with workspace-write but expect read-only to be enforced
         result_json = await codex_delegate(
@@ -62,16 +68,17 @@ class TestReadOnlyMode(unittest.IsolatedAsyncioTestCase):
 
     @patch.dict(os.environ, {"CODEX_ALLOW_WRITE": "true", "CODEX_BACKEND": "cli"})
     @patch("claude_codex_bridge.bridge_server.invoke_codex_cli")
-    @patch("claude_codex_bridge.bridge_server.dde.validate_working_directory")
-    @patch("claude_codex_bridge.bridge_server.dde.should_delegate")
+    @patch.object(DelegationDecisionEngine, "validate_working_directory")
+    @patch.object(DelegationDecisionEngine, "should_delegate")
     async def test_sandbox_mode_preserved_when_write_enabled(
         self, mock_should_delegate, mock_validate_dir, mock_invoke_codex
     ):
         """Test that sandbox_mode is preserved when write is enabled."""
+        reload_config()
         # Setup mocks
         mock_validate_dir.return_value = True
         mock_should_delegate.return_value = True
-        mock_invoke_codex.return_value = ("mock output", "")
+        mock_invoke_codex.return_value = ("mock output", b"")
 
         # Call with workspace-write and expect it to be preserved
         result_json = await codex_delegate(
@@ -96,16 +103,17 @@ class TestReadOnlyMode(unittest.IsolatedAsyncioTestCase):
 
     @patch.dict(os.environ, {"CODEX_ALLOW_WRITE": "false", "CODEX_BACKEND": "cli"})
     @patch("claude_codex_bridge.bridge_server.invoke_codex_cli")
-    @patch("claude_codex_bridge.bridge_server.dde.validate_working_directory")
-    @patch("claude_codex_bridge.bridge_server.dde.should_delegate")
+    @patch.object(DelegationDecisionEngine, "validate_working_directory")
+    @patch.object(DelegationDecisionEngine, "should_delegate")
     async def test_readonly_mode_not_overridden_when_already_readonly(
         self, mock_should_delegate, mock_validate_dir, mock_invoke_codex
     ):
         """Test that read-only mode is not overridden when already read-only."""
+        reload_config()
         # Setup mocks
         mock_validate_dir.return_value = True
         mock_should_delegate.return_value = True
-        mock_invoke_codex.return_value = ("mock output", "")
+        mock_invoke_codex.return_value = ("mock output", b"")
 
         # Call with read-only mode
         result_json = await codex_delegate(
@@ -124,9 +132,10 @@ class TestReadOnlyMode(unittest.IsolatedAsyncioTestCase):
         self.assertNotIn("operation_mode", result)
 
     @patch.dict(os.environ, {"CODEX_ALLOW_WRITE": "false"})
-    @patch("claude_codex_bridge.bridge_server.dde.validate_working_directory")
+    @patch.object(DelegationDecisionEngine, "validate_working_directory")
     async def test_mode_notice_included_in_error_response(self, mock_validate_dir):
         """Test that mode notice is included in error responses."""
+        reload_config()
         # Setup mock to trigger an error
         mock_validate_dir.return_value = False
 
@@ -146,6 +155,69 @@ class TestReadOnlyMode(unittest.IsolatedAsyncioTestCase):
         self.assertEqual(result["sandbox_mode"], "read-only")
         self.assertEqual(result["requested_sandbox_mode"], "workspace-write")
 
+    @patch.dict(os.environ, {"CODEX_ALLOW_WRITE": "false", "CODEX_BACKEND": "cli"})
+    @patch("claude_codex_bridge.bridge_server.invoke_codex_cli")
+    @patch.object(DelegationDecisionEngine, "validate_working_directory")
+    @patch.object(DelegationDecisionEngine, "should_delegate")
+    async def test_raw_stderr_is_decoded_into_result(
+        self, mock_should_delegate, mock_validate_dir, mock_invoke_codex
+    ):
+        """Test that raw stderr bytes from Codex are decoded for the response."""
+        reload_config()
+        mock_validate_dir.return_value = True
+        mock_should_delegate.return_value = True
+        mock_invoke_codex.return_value = ("mock output", "warning: ✓\n".encode())
+
+        result_json = await codex_delegate(
+            task_description="Test task",
+            working_directory="/tmp/test",
+        )
+
+        result = json.loads(result_json)
+        self.assertEqual(result["stderr"], "warning: ✓")
+
+    @patch.dict(
+        os.environ,
+        {
+            "CODEX_ALLOW_WRITE": "false",
+            "CODEX_BACKEND": "cli",
+            "CODEX_MAX_ERROR_CONTENT": "60",
+        },
+    )
+    @patch("claude_codex_bridge.bridge_server.invoke_codex_cli")
+    @patch.object(DelegationDecisionEngine, "validate_working_directory")
+    @patch.object(DelegationDecisionEngine, "should_delegate")
+    async def test_long_exception_message_keeps_its_prefix(
+        self, mock_should_delegate, mock_validate_dir, mock_invoke_codex
+    ):
+        """Test that truncated exception messages keep what failed."""
+        reload_config()
+        mock_validate_dir.return_value = True
+        mock_should_delegate.return_value = True
+        prefix = "Codex CLI execution failed (exit code: 2): "
+        mock_invoke_codex.side_effect = RuntimeError(prefix + "e" * 100)
+
+        result = json.loads(
+            await codex_delegate(
+                task_description="Test task",
+                working_directory="/tmp/test",
+            )
+        )
+
+        self.assertEqual(result["status"], "error")
+        self.assertTrue(result["message"].startswith(prefix))
+        self.assertTrue(result["message"].endswith("\n...(truncated 83 chars)"))
+
+    async def test_instructions_mention_modes_only_with_write_enabled(self):
+        """Test that server instructions mention modes only with write enabled."""
+        with patch.dict(os.environ, {"CODEX_ALLOW_WRITE": "true"}):
+            reload_config()
+            self.assertIn("--allow-write", _get_dynamic_instructions())
+
+        with patch.dict(os.environ, {"CODEX_ALLOW_WRITE": "false"}):
+            reload_config()
+            self.assertNotIn("--allow-write", _get_dynamic_instructions())
+
     def test_operation_mode_notice_structure(self):
         """Test the structure of operation_mode notice."""
         # This tests the structure that should be included when mode is overridden
@@ -1,31 +1,13 @@
 """Tests for task complexity parameter propagation to Codex CLI."""
 
-import asyncio
 import os
 import tempfile
 import unittest
 from unittest.mock import patch
 
+from claude_codex_bridge import bridge_server
 from claude_codex_bridge.bridge_server import codex_delegate
-
-
-class DummyProcess:
-    def __init__(self, returncode: int = 0, stdout: bytes = b"ok", stderr: bytes = b""):
-        self.returncode = returncode
-        self._stdout = stdout
-        self._stderr = stderr
-
-    async def communicate(self):
-        return self._stdout, self._stderr
-
-    def terminate(self):  # pragma: no cover - simple stub
-        pass
-
-    async def wait(self):  # pragma: no cover - simple stub
-        return
-
-    def kill(self):  # pragma: no cover - simple stub
-        pass
+from process_stubs import DummyProcess
 
 
 class TestTaskComplexity(unittest.IsolatedAsyncioTestCase):
@@ -38,9 +20,10 @@ class TestTaskComplexity(unittest.IsolatedAsyncioTestCase):
 
         with patch.dict(os.environ, {"CODEX_BACKEND": "cli"}):
             with patch.object(
-                asyncio, "create_subprocess_exec", side_effect=fake_subprocess_exec
+                bridge_server, "_spawn_codex_process", side_effect=fake_subprocess_exec
             ):
                 os.environ["CODEX_ALLOW_WRITE"] = "false"
+                bridge_server.reload_config()
 
                 with tempfile.TemporaryDirectory() as tmpdir:
                     await codex_delegate(
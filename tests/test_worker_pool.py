@@ -0,0 +1,183 @@
+"""Tests for reuse of long-lived Codex MCP sessions across delegations."""
+
+import asyncio
+import contextlib
+import unittest
+from unittest.mock import patch
+
+from claude_codex_bridge import bridge_server
+from claude_codex_bridge.bridge_server import CodexWorkerPool
+
+
+class FakeSession:
+    """Session answering pings until it is marked dead or hung."""
+
+    def __init__(self):
+        self.dead = False
+        self.hung = False
+
+    async def send_ping(self):
+        if self.hung:
+            await asyncio.sleep(60)
+        if self.dead:
+            raise ConnectionError("connection closed")
+
+
+class SessionFactory:
+    """Fake session factory tracking how many sessions are open."""
+
+    def __init__(self):
+        self.opened = 0
+        self.closed = 0
+        self.sessions = []
+
+    @contextlib.asynccontextmanager
+    async def __call__(self):
+        self.opened += 1
+        session = FakeSession()
+        self.sessions.append(session)
+        try:
+            yield session
+        finally:
+            self.closed += 1
+
+
+class TestCodexWorkerPool(unittest.IsolatedAsyncioTestCase):
+    async def test_session_reused_for_same_key(self):
+        pool = CodexWorkerPool()
+        factory = SessionFactory()
+
+        async with pool.acquire(("codex", "/tmp"), factory, max_idle=2) as first:
+            first_session = first.session
+        async with pool.acquire(("codex", "/tmp"), factory, max_idle=2) as second:
+            self.assertIs(second.session, first_session)
+
+        self.assertEqual(factory.opened, 1)
+        await pool.close()
+        self.assertEqual(factory.closed, 1)
+
+    async def test_different_keys_use_separate_sessions(self):
+        pool = CodexWorkerPool()
+        factory = SessionFactory()
+
+        async with pool.acquire(("codex", "/tmp/a"), factory, max_idle=2):
+            pass
+        async with pool.acquire(("codex", "/tmp/b"), factory, max_idle=2):
+            pass
+
+        self.assertEqual(factory.opened, 2)
+        await pool.close()
+
+    async def test_failed_call_discards_worker(self):
+        pool = CodexWorkerPool()
+        factory = SessionFactory()
+
+        with self.assertRaises(RuntimeError):
+            async with pool.acquire(("codex", "/tmp"), factory, max_idle=2):
+                raise RuntimeError("tool call failed")
+        self.assertEqual(factory.closed, 1)
+
+        async with pool.acquire(("codex", "/tmp"), factory, max_idle=2):
+            pass
+        self.assertEqual(factory.opened, 2)
+        await pool.close()
+
+    async def test_zero_pool_size_disables_reuse(self):
+        pool = CodexWorkerPool()
+        factory = SessionFactory()
+
+        for _ in range(2):
+            async with pool.acquire(("codex", "/tmp"), factory, max_idle=0):
+                pass
+
+        self.assertEqual(factory.opened, 2)
+        self.assertEqual(factory.closed, 2)
+
+    async def test_startup_error_propagates(self):
+        pool = CodexWorkerPool()
+
+        @contextlib.asynccontextmanager
+        async def failing_factory():
+            raise FileNotFoundError("codex")
+            yield  # pragma: no cover
+
+        with self.assertRaises(FileNotFoundError):
+            async with pool.acquire(("codex", "/tmp"), failing_factory, max_idle=2):
+                pass  # pragma: no cover
+
+    async def test_session_dying_while_idle_is_replaced_at_checkout(self):
+        pool = CodexWorkerPool()
+        factory = SessionFactory()
+        key = ("codex", "/tmp")
+
+        async with pool.acquire(key, factory, max_idle=2):
+            pass
+        factory.sessions[0].dead = True
+        async with pool.acquire(key, factory, max_idle=2) as worker:
+            self.assertIs(worker.session, factory.sessions[1])
+
+        self.assertEqual(factory.opened, 2)
+        self.assertEqual(factory.closed, 1)
+        await pool.close()
+
+    async def test_unresponsive_idle_session_is_replaced(self):
+        pool = CodexWorkerPool()
+        factory = SessionFactory()
+        key = ("codex", "/tmp")
+
+        async with pool.acquire(key, factory, max_idle=2):
+            pass
+        factory.sessions[0].hung = True
+        with patch.object(bridge_server, "_MCP_PING_TIMEOUT", 0.01):
+            async with pool.acquire(key, factory, max_idle=2) as worker:
+                self.assertIs(worker.session, factory.sessions[1])
+
+        await pool.close()
+        self.assertEqual(factory.closed, 2)
+
+    async def test_idle_cap_applies_across_keys(self):
+        pool = CodexWorkerPool()
+        factory = SessionFactory()
+
+        for i in range(5):
+            async with pool.acquire(("codex", f"/tmp/{i}"), factory, max_idle=2):
+                pass
+
+        self.assertEqual(len(pool), 2)
+        self.assertEqual(factory.closed, 3)
+
+        # The most recently used keys are the ones kept
+        async with pool.acquire(("codex", "/tmp/4"), factory, max_idle=2):
+            pass
+        self.assertEqual(factory.opened, 5)
+        await pool.close()
+
+    async def test_idle_sessions_expire(self):
+        pool = CodexWorkerPool()
+        factory = SessionFactory()
+
+        with patch.object(bridge_server, "_MCP_IDLE_TTL", 0.01):
+            async with pool.acquire(("codex", "/tmp"), factory, max_idle=2):
+                pass
+            await asyncio.sleep(0.05)
+
+        self.assertEqual(len(pool), 0)
+        self.assertEqual(factory.closed, 1)
+        await pool.close()
+
+    async def test_server_shutdown_closes_pool(self):
+        factory = SessionFactory()
+        async with bridge_server.codex_pool.acquire(
+            ("codex", "/tmp"), factory, max_idle=2
+        ):
+            pass
+
+        async with bridge_server._server_lifespan(bridge_server.mcp):
+            pass
+
+        self.assertEqual(factory.closed, 1)
+        self.assertEqual(len(bridge_server.codex_pool), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
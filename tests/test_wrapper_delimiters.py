@@ -3,6 +3,7 @@
 import unittest
 
 from src.claude_codex_bridge.bridge_server import (
+    _escape_delimiter_for_display,
     _extract_wrapped_content,
     parse_codex_output,
 )
@@ -181,5 +182,18 @@ class TestParseCodexOutputWithWrapperDelimiters(unittest.TestCase):
         self.assertNotIn("reasoning text", result["content"])
 
 
+class TestDelimiterDisplayEscaping(unittest.TestCase):
+    """Test escaping of delimiters shown in prompt instructions."""
+
+    def test_square_brackets_are_escaped(self):
+        """Test that every square bracket gets a backslash prefix."""
+        self.assertEqual(_escape_delimiter_for_display("--[=["), r"--\[=\[")
+        self.assertEqual(_escape_delimiter_for_display("]=]--"), r"\]=\]--")
+
+    def test_other_characters_unchanged(self):
+        """Test that delimiters without brackets are returned as-is."""
+        self.assertEqual(_escape_delimiter_for_display("<<END>>"), "<<END>>")
+
+
 if __name__ == "__main__":
     unittest.main()